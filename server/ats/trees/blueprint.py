@@ -5,6 +5,7 @@ from server.ats.trees.common import (
     BaseTree,
     MappingNode,
     ObjectNode,
+    ScalarMappingNode,
     ScalarMappingsSequence,
     ScalarNode,
     ScalarNodesSequence,
@@ -206,3 +207,6 @@ class BlueprintTree(BaseTree):
 
     def get_services(self) -> List[ServiceResourceNode]:
         return self._get_seq_nodes("services")
+
+    def get_clouds(self) -> List[ScalarMappingNode]:
+        return self._get_seq_nodes("clouds")
@@ -1,11 +1,15 @@
-PREDEFINED_TORQUE_INPUTS = [
-    "$torque.environment.id",
-    "$torque.environment.virtual_network_id",
-    "$torque.environment.public_address",
-    "$torque.repos.current.current",
-    "$torque.repos.current.url",
-    "$torque.repos.current.token",
-]
+# kept lowercased, callers compare against the lowercased variable name
+PREDEFINED_TORQUE_INPUTS = frozenset(
+    var.lower()
+    for var in [
+        "$torque.environment.id",
+        "$torque.environment.virtual_network_id",
+        "$torque.environment.public_address",
+        "$torque.repos.current.current",
+        "$torque.repos.current.url",
+        "$torque.repos.current.token",
+    ]
+)
 
 AWS_REGIONS = [
     "us-east-2",
@@ -58,6 +58,7 @@ from server.utils import common
 from server.utils.applications import ApplicationsManager as applications
 from server.utils.common import get_repo_root_path, is_var_allowed
 from server.utils.services import ServicesManager as services
+from server.utils.yaml_utils import SafeLoader
 from server.validation.factory import ValidatorFactory
 
 DEBOUNCE_DELAY = 0.3
@@ -182,7 +183,7 @@ def did_change(server: TorqueLanguageServer, params: DidChangeTextDocumentParams
         text_doc = server.workspace.get_document(params.text_document.uri)
 
         source = text_doc.source
-        yaml_obj = yaml.load(source, Loader=yaml.FullLoader)  # todo: refactor
+        yaml_obj = yaml.load(source, Loader=SafeLoader)  # todo: refactor
         doc_type = yaml_obj.get("kind", "")
 
         if doc_type == "application":
@@ -221,7 +222,7 @@ async def workspace_changed(
                     text_doc = server.workspace.get_document(change.uri)
                     source = text_doc.source
                     yaml_obj = yaml.load(
-                        source, Loader=yaml.FullLoader
+                        source, Loader=SafeLoader
                     )  # todo: refactor
                     doc_type = yaml_obj.get("kind", "")
 
@@ -275,7 +276,7 @@ def completions(
     doc = server.workspace.get_document(params.text_document.uri)
 
     try:
-        yaml_obj = yaml.load(doc.source, Loader=yaml.FullLoader)
+        yaml_obj = yaml.load(doc.source, Loader=SafeLoader)
         if yaml_obj and isinstance(yaml_obj, dict):
             doc_type = yaml_obj.get("kind", None)
         else:
@@ -592,7 +593,7 @@ def code_lens(
         doc = server.workspace.get_document(params.text_document.uri)
 
         try:
-            yaml_obj = yaml.load(doc.source, Loader=yaml.FullLoader)
+            yaml_obj = yaml.load(doc.source, Loader=SafeLoader)
         except yaml.MarkedYAMLError:
             yaml_obj = None
 
@@ -696,7 +697,7 @@ async def lsp_document_link(
 
     doc = server.workspace.get_document(params.text_document.uri)
     try:
-        yaml_obj = yaml.load(doc.source, Loader=yaml.FullLoader)
+        yaml_obj = yaml.load(doc.source, Loader=SafeLoader)
         if yaml_obj and isinstance(yaml_obj, dict):
             doc_type = yaml_obj.get("kind", "")
         else:
@@ -10,6 +10,8 @@ class ApplicationsManager(ResourcesManager):
     resource_folder = "applications"
     resource_type = "application"
     cache = APPLICATIONS
+    scanned_folders = {}
+    reloaded_sources = {}
 
     @staticmethod
     def build_completion_text(resource_name: str, resource_tree: BaseTree):
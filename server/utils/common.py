@@ -11,6 +11,7 @@ from server.ats.trees.common import (
     MappingNode,
     Position,
     TextNode,
+    TreeWithOutputs,
     YamlNode,
 )
 from server.utils.yaml_utils import format_yaml
@@ -18,6 +19,18 @@ from server.utils.yaml_utils import format_yaml
 
 class ResourcesManager:
     cache = {}
+    # normalized resources folder the cache was loaded from
+    cache_folder = None
+    # normalized resources folder -> (its mtime at the moment it was scanned,
+    # its resources if they are not the ones in the cache)
+    scanned_folders = {}
+    # normalized resources folder -> {resource name -> source of the opened
+    # document it was reloaded from}, re-applied after a rescan because
+    # the document may be unsaved
+    reloaded_sources = {}
+    # incremented on every change of the cache, so results computed
+    # from the cached resources can tell they are outdated
+    generation = 0
     resource_folder = ""
     resource_type = ""
 
@@ -38,11 +51,20 @@ class ResourcesManager:
 
     @classmethod
     def load_res_details(cls, resource_name: str, resource_source: str):
+        cls.generation += 1
+        cls.cache[resource_name] = cls._get_res_details(resource_name, resource_source)
+
+    @classmethod
+    def _get_res_details(cls, resource_name: str, resource_source: str):
         resource_tree = None
         output = None
+        inputs = {}
+        outputs = None
         try:
             resource_tree = Parser(document=resource_source).parse()
             output = cls.build_completion_text(resource_name, resource_tree)
+            inputs = cls._collect_inputs(resource_tree)
+            outputs = cls._collect_outputs(resource_tree)
         except ParserError as e:
             logging.warning(
                 f"Unable to load {cls.resource_type} '{resource_name}.yaml' due to error: {e.message}"
@@ -52,70 +74,120 @@ class ResourcesManager:
                 f"Unable to load {cls.resource_type} '{resource_name}.yaml' due to error: {str(e)}"
             )
 
-        cls.cache[resource_name] = {
+        return {
             "tree": resource_tree,
             "completion": format_yaml(output) if output else None,
+            "inputs": inputs,
+            "outputs": outputs,
         }
 
+    @staticmethod
+    def _collect_inputs(resource_tree: BaseTree):
+        inputs = {}
+        if resource_tree.inputs:
+            for input_node in resource_tree.get_inputs():
+                inputs[input_node.key.text] = (
+                    input_node.value.text if input_node.value else None
+                )
+        return inputs
+
+    @staticmethod
+    def _collect_outputs(resource_tree: BaseTree):
+        # None when the outputs are unknown, e.g. the file has a wrong kind
+        if not isinstance(resource_tree, TreeWithOutputs):
+            return None
+        return [out.text for out in resource_tree.get_outputs()]
+
     @classmethod
     def reload_resource_details(cls, resource_name, resource_source):
         if cls.cache:  # if there is already a cache, add this file
+            sources = cls.reloaded_sources.setdefault(cls.cache_folder, {})
+            sources[resource_name] = resource_source
             cls.load_res_details(resource_name, resource_source)
 
     @classmethod
     def remove_resource_details(cls, resource_name):
         if cls.cache:  # if there is already a cache, remove this file
+            cls.reloaded_sources.get(cls.cache_folder, {}).pop(resource_name, None)
             if resource_name in cls.cache:
                 cls.cache.pop(resource_name)
+                cls.generation += 1
 
     @classmethod
     def get_available_resources(cls, root_folder: str = None):
-        if cls.cache:
+        if not root_folder:
+            return cls.cache if cls.cache else None
+
+        # callers may pass the same folder in different forms
+        resources_path = os.path.normcase(
+            os.path.realpath(os.path.join(root_folder, cls.resource_folder))
+        )
+        try:
+            mtime = os.stat(resources_path).st_mtime
+        except OSError:
+            mtime = None
+
+        if mtime is None and resources_path != cls.cache_folder:
+            # not a repo root, e.g. the workspace is a parent folder of the repo,
+            # so keep the resources that are already known
             return cls.cache
-        else:
-            if root_folder:
-                resources_path = os.path.join(root_folder, cls.resource_folder)
-                if os.path.exists(resources_path):
-                    for folder in os.listdir(resources_path):
-                        res_dir = os.path.join(resources_path, folder)
-                        if os.path.isdir(res_dir):
-                            files = os.listdir(res_dir)
-                            if f"{folder}.yaml" in files:
-                                f = open(os.path.join(res_dir, f"{folder}.yaml"), "r")
-                                source = f.read()
-                                cls.load_res_details(folder, source)
 
+        # the folder mtime changes only when resources are added, removed or renamed,
+        # edits of existing resources are tracked by reload_resource_details
+        scanned = cls.scanned_folders.get(resources_path)
+        if scanned is not None and scanned[0] == mtime:
+            if resources_path == cls.cache_folder:
                 return cls.cache
-            else:
-                return None
+            resources = scanned[1]
+        else:
+            resources = cls._scan_resources(resources_path, mtime)
+
+        # keep the resources of the previous folder, including reloaded documents,
+        # to switch back to them without a rescan
+        prev_scanned = cls.scanned_folders.get(cls.cache_folder)
+        if prev_scanned is not None and resources_path != cls.cache_folder:
+            cls.scanned_folders[cls.cache_folder] = (prev_scanned[0], dict(cls.cache))
+
+        cls.cache.clear()
+        cls.cache.update(resources)
+        cls.generation += 1
+        cls.cache_folder = resources_path
+        cls.scanned_folders[resources_path] = (mtime, None)
+        return cls.cache
 
     @classmethod
-    def get_available_resources_names(cls):
-        if cls.cache:
-            return list(cls.cache.keys())
-        else:
-            return []
+    def _scan_resources(cls, resources_path: str, mtime):
+        # the resources are collected into a new dict, so a failure
+        # in the middle of the scan leaves the cache in place
+        resources = {}
+        if mtime is None:
+            return resources
+
+        reloaded_sources = cls.reloaded_sources.get(resources_path, {})
+        for folder in os.listdir(resources_path):
+            res_dir = os.path.join(resources_path, folder)
+            res_file = os.path.join(res_dir, f"{folder}.yaml")
+            if os.path.isdir(res_dir) and os.path.isfile(res_file):
+                source = reloaded_sources.get(folder)
+                if source is None:
+                    with open(res_file, "r") as f:
+                        source = f.read()
+                resources[folder] = cls._get_res_details(folder, source)
+
+        return resources
 
     @classmethod
     def get_inputs(cls, resource_name):
         if resource_name in cls.cache:
-            resource_tree = cls.cache[resource_name]["tree"]
-            if resource_tree and resource_tree.inputs:
-                inputs = {}
-                for input_node in resource_tree.get_inputs():
-                    inputs[input_node.key.text] = (
-                        input_node.value.text if input_node.value else None
-                    )
-                return inputs
+            return cls.cache[resource_name]["inputs"]
 
         return {}
 
     @classmethod
     def get_outputs(cls, resource_name):
+        # returns None if the resource is not valid and its outputs are unknown
         if resource_name in cls.cache:
-            res_tree = cls.cache[resource_name]["tree"]
-            outputs = [out.text for out in res_tree.get_outputs()]
-            return outputs
+            return cls.cache[resource_name]["outputs"]
 
         return []
 
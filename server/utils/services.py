@@ -1,48 +1,66 @@
-import pathlib
+import os
 import re
 
-import yaml
 from server.utils.common import ResourcesManager
 
 SERVICES = {}
 
+# variable assignment in a tfvars file, HCL allows it to be indented
+_TFVAR_RE = re.compile(r"\s*([A-Za-z_][\w-]*)\s*=")
+# string literals and comments, brackets in them do not open or close blocks
+_TFVAR_IGNORED_RE = re.compile(r'"(?:[^"\\\n]|\\.)*"|(?:#|//).*')
+
 
 class ServicesManager(ResourcesManager):
     resource_type = "service"
     resource_folder = "services"
     cache = SERVICES
+    scanned_folders = {}
+    reloaded_sources = {}
 
     @staticmethod
     def get_vars_from_tfvars(file_path: str):
+        variables = []
+        # nesting level of {} and [] blocks, only assignments outside
+        # of them are variables, the rest are keys of map values
+        depth = 0
         with open(file_path, "r") as f:
-            content = f.read()
-            variables = re.findall(r"(^.+?)\s*=", content, re.MULTILINE)
+            for line in f:
+                code = _TFVAR_IGNORED_RE.sub('""', line)
+                if depth == 0:
+                    match = _TFVAR_RE.match(code)
+                    if match:
+                        variables.append(match.group(1))
+                depth += code.count("{") + code.count("[")
+                depth = max(depth - code.count("}") - code.count("]"), 0)
 
         return variables
 
     @staticmethod
     def get_service_vars(service_dir_path: str):
-        with open(service_dir_path.replace("file://", ""), "r") as stream:
-            try:
-                yaml_obj = yaml.load(stream, Loader=yaml.FullLoader)
-                doc_type = yaml_obj.get("kind", "")
-            except yaml.YAMLError:
+        service_path = service_dir_path.replace("file://", "")
+        # only the top-level 'kind' is needed, no need to parse the whole document
+        # utf-8-sig skips the BOM some editors put at the start of the file
+        with open(service_path, "r", encoding="utf-8-sig") as stream:
+            for line in stream:
+                if line.startswith("kind:"):
+                    doc_type = line[5:].split("#")[0].strip().strip("\"'")
+                    break
+            else:
                 return []
 
         if doc_type == "TerraForm":
             tfvars = []
-            files = pathlib.Path(service_dir_path.replace("file://", "")).parent.glob(
-                "./*"
-            )
-            for file in files:
-                if file.name.endswith(".tfvars"):
-                    item = {
-                        "file": pathlib.Path(file).name,
-                        "variables": ServicesManager.get_vars_from_tfvars(
-                            file.as_posix()
-                        ),
-                    }
-                    tfvars.append(item)
+            with os.scandir(os.path.dirname(service_path)) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".tfvars") and entry.is_file():
+                        item = {
+                            "file": entry.name,
+                            "variables": ServicesManager.get_vars_from_tfvars(
+                                entry.path
+                            ),
+                        }
+                        tfvars.append(item)
 
             return tfvars
 
@@ -1,6 +1,10 @@
+import yaml
 from ruamel.yaml import YAML
 from ruamel.yaml.compat import StringIO
 
+# libyaml based loader is much faster, pyyaml may be built without it
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class StringYAML(YAML):
     def dump(self, data, stream=None, **kw):
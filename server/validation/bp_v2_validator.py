@@ -178,7 +178,7 @@ class BlueprintSpec2Validator(ValidationHandler):
         super().__init__(tree, document)
 
     def _get_grains_names(self):
-        return [node.key.text for node in self.tree.grains.nodes]
+        return frozenset(node.key.text for node in self.tree.grains.nodes)
 
     def _validate_no_duplicates_in_grain_outputs(self):
         message = "Multiple declarations of output '{}'"
@@ -234,9 +234,9 @@ class BlueprintSpec2Validator(ValidationHandler):
                 )
             
     def _validate_grain_dep_exists(self):
+        grains_names = self._get_grains_names()
         for grain in self.tree.grain_nodes:
             grain_name = grain.key.text
-            grains_list = self._get_grains_names()
             deps = grain.value.get_deps() if grain.value else None
 
             if deps is None:
@@ -246,7 +246,7 @@ class BlueprintSpec2Validator(ValidationHandler):
                 start_pos = d["start"]
                 end_pos = d["end"]
 
-                if d["name"] not in grains_list:
+                if d["name"] not in grains_names:
                     self._add_diagnostic(
                         start_pos=(start_pos.line, start_pos.col),
                         end_pos=(end_pos.line, end_pos.col),
@@ -1,13 +1,10 @@
+import hashlib
 import logging
 import re
 import sys
+from collections import OrderedDict
 
-from pygls.lsp.types.basic_structures import (
-    Diagnostic,
-    DiagnosticSeverity,
-    Position,
-    Range,
-)
+from pygls.lsp.types.basic_structures import DiagnosticSeverity
 from server.ats.trees.blueprint import BlueprintTree
 from server.ats.trees.common import ScalarNode
 from server.constants import (
@@ -20,11 +17,38 @@ from server.utils.common import get_repo_root_path
 from server.utils.services import ServicesManager as services
 from server.validation.common import ValidationHandler
 
+# matches every ${var} reference or a value which is a bare $var as a whole
+_VAR_RE = re.compile(r"\$\{[^}\n]+\}|^\$.+$")
+
+_AUTO_VAR_KINDS = frozenset(["applications", "services", "parameters", "repos"])
+# (kind, section) pairs allowed in $torque.<kind>.<name>.<section>.<field>
+_VALID_KIND_SECTIONS = frozenset(
+    [("applications", "outputs"), ("applications", "dns"), ("services", "outputs")]
+)
+
 
 class BlueprintValidationHandler(ValidationHandler):
+    # (document path, source hash, resources generations) -> diagnostics
+    # of the latest validated documents
+    results_cache = OrderedDict()
+    results_cache_size = 16
+
     def __init__(self, tree: BlueprintTree, document_path: str):
-        self.blueprint_apps = [app.id.text for app in tree.get_applications()]
-        self.blueprint_services = [srv.id.text for srv in tree.get_services()]
+        # id -> nodes with this id, there is more than one node for duplicates
+        self._apps_by_id = {}
+        for app in tree.get_applications():
+            self._apps_by_id.setdefault(app.id.text, []).append(app)
+        self._srvs_by_id = {}
+        for srv in tree.get_services():
+            self._srvs_by_id.setdefault(srv.id.text, []).append(srv)
+
+        self.blueprint_apps = frozenset(self._apps_by_id)
+        self.blueprint_services = frozenset(self._srvs_by_id)
+        self._apps_n_srvs = self.blueprint_apps | self.blueprint_services
+        self.blueprint_inputs = frozenset(input.key.text for input in tree.get_inputs())
+        # names of the inputs used by apps, services and artifacts,
+        # collected while they are validated
+        self._used_inputs = set()
         super().__init__(tree, document_path)
 
     def _check_for_deprecated_syntax(self):
@@ -57,237 +81,229 @@ class BlueprintValidationHandler(ValidationHandler):
 
             line_num += 1
 
-    def _validate_dependency_exists(self):
+    def _check_resource_dependencies(self, res):
         message = "The application/service '{}' is not defined in the applications/services section"
-        apps = self.blueprint_apps
-        srvs = self.blueprint_services
-
-        apps_n_srvs = set(apps + srvs)
-        tree_resources = self._tree.get_applications() + self._tree.get_services()
+        res_name = res.id.text
+        deps = res.deps
+        deps_names = {dep.text for dep in deps}
 
-        for res in tree_resources:
-            deps_names = [dep.text for dep in res.deps]
-            deps = res.deps
+        for dep in deps:
+            dep_name = dep.text
+            if dep_name == res_name:
+                self._add_diagnostic(
+                    dep,
+                    message=f"The resource '{res_name}' cannot be dependent of itself",
+                )
+            elif dep_name not in self._apps_n_srvs:
+                self._add_diagnostic(dep, message=message.format(dep_name))
+
+        for input in res.inputs:
+            if input.value is None:
+                continue
+            value = input.value.text
+            if "torque.applications." in value or "torque.services." in value:
+                found = re.findall("torque\.(applications|services)\.(.+?)\.", value)
+                for f in found:
+                    if f[1] not in deps_names:
+                        self._add_diagnostic(
+                            input.value,
+                            message=f"The app '{res_name}' is missing a dependency to '{f[1]}'.",
+                        )
 
-            for dep in deps:
-                if dep.text not in apps_n_srvs:
-                    self._add_diagnostic(dep, message=message.format(dep.text))
-                elif dep.text == res.id.text:
-                    self._add_diagnostic(
-                        dep,
-                        message=f"The resource '{res.id.text}' cannot be dependent of itself",
-                    )
+    def _check_input_has_value(self, var, res_type: str):
+        if not var.value and var.key.text not in self.blueprint_inputs:
+            self._add_diagnostic(
+                var.key,
+                message=f"{res_type} input must have a value or a blueprint input with the same name should be defined",
+            )
 
-            for input in res.inputs:
-                if input.value is None:
-                    continue
-                if input.value and (
-                    "torque.applications." in input.value.text
-                    or "torque.services." in input.value.text
-                ):
-                    found = re.findall(
-                        "torque\.(applications|services)\.(.+?)\.", input.value.text
-                    )
-                    for f in found:
-                        if f[1] not in deps_names:
-                            self._add_diagnostic(
-                                input.value,
-                                message=f"The app '{res.id.text}' is missing a dependency to '{f[1]}'.",
-                            )
-
-    def _validate_non_existing_app_is_used(self):
-        message = "The app '{}' could not be found in the /applications folder"
-        available_apps = applications.get_available_resources_names()
+    def _validate_resources(self, available_apps, available_srvs):
+        # all checks of a single app or service are done while visiting it,
+        # so the tree is walked only once
         for app in self._tree.get_applications():
-            if app.id.text not in available_apps:
-                self._add_diagnostic(app.id, message=message.format(app.id.text))
+            self._visit_app(app, available_apps)
 
-    def _validate_used_apps_are_valid(self):
-        message = "The app '{}' is not valid. Open the file to get more details."
-        available_apps = applications.get_available_resources()
-        for app in self._tree.get_applications():
-            if app.id.text in available_apps:
-                if available_apps[app.id.text]["tree"] is None:
-                    self._add_diagnostic(app.id, message=message.format(app.id.text))
-
-    def _validate_blueprint_resources_have_input_values(self):
-        resources = {
-            "Application": self._tree.get_applications(),
-            "Service": self._tree.get_services(),
-        }
-        blueprint_inputs = {input.key.text: 1 for input in self._tree.get_inputs()}
+        for srv in self._tree.get_services():
+            self._visit_service(srv, available_srvs)
 
-        for name, container in resources.items():
-            for res in container:
-                for var in res.inputs:
-                    if not var.value and var.key.text not in blueprint_inputs:
-                        self._add_diagnostic(
-                            var.key,
-                            message=f"{name} input must have a value or a blueprint input with the same name should be defined",
-                        )
+    def _visit_app(self, app, available_apps):
+        app_name = app.id.text
+        self._check_resource_dependencies(app)
 
-    def _validate_non_existing_service_is_used(self):
-        message = "The service '{}' could not be found in the /services folder"
-        available_srvs = services.get_available_resources_names()
-        for srv in self._tree.get_services():
-            if srv.id.text not in available_srvs:
-                self._add_diagnostic(srv.id, message=message.format(srv.id.text))
+        if app_name not in available_apps:
+            self._add_diagnostic(
+                app.id,
+                message=f"The app '{app_name}' could not be found in the /applications folder",
+            )
+            self._check_resource_inputs(app, "Application")
+            return
 
-    def _validate_used_services_are_valid(self):
-        message = "The service '{}' is not valid. Open the file to get more details."
-        available_srvs = services.get_available_resources()
-        for srv in self._tree.get_services():
-            if srv.id.text in available_srvs:
-                if available_srvs[srv.id.text]["tree"] is None:
-                    self._add_diagnostic(srv.id, message=message.format(srv.id.text))
+        if available_apps[app_name]["tree"] is None:
+            self._add_diagnostic(
+                app.id,
+                message=f"The app '{app_name}' is not valid. Open the file to get more details.",
+            )
+        self._check_resource_inputs(app, "Application", applications.get_inputs(app_name))
+
+    def _visit_service(self, srv, available_srvs):
+        srv_name = srv.id.text
+        self._check_resource_dependencies(srv)
+
+        if srv_name not in available_srvs:
+            self._add_diagnostic(
+                srv.id,
+                message=f"The service '{srv_name}' could not be found in the /services folder",
+            )
+            self._check_resource_inputs(srv, "Service")
+            return
+
+        if available_srvs[srv_name]["tree"] is None:
+            self._add_diagnostic(
+                srv.id,
+                message=f"The service '{srv_name}' is not valid. Open the file to get more details.",
+            )
+        self._check_resource_inputs(srv, "Service", services.get_inputs(srv_name))
+
+    def _check_resource_inputs(self, res, res_type: str, declared_inputs: dict = None):
+        # declared_inputs is None when the resource is not found in the repo
+        used_inputs = set()
+        for input in res.inputs:
+            input_name = input.key.text
+            used_inputs.add(input_name)
+            if input.value is None:
+                self._used_inputs.add(input_name)
+
+            self._check_input_has_value(input, res_type)
+            self._confirm_variable_defined_in_blueprint_or_auto_var(
+                self.blueprint_inputs, input
+            )
+            if declared_inputs is not None and input_name not in declared_inputs:
+                self._add_diagnostic(
+                    input.key,
+                    message=f"The {res_type.lower()} '{res.id.text}' does not have an "
+                    f"input named '{input_name}'",
+                )
+
+        if declared_inputs:
+            missing_inputs = [
+                name
+                for name, default in declared_inputs.items()
+                if default is None and name not in used_inputs
+            ]
+            if missing_inputs:
+                self._add_diagnostic(
+                    res.id,
+                    message=f"The following mandatory inputs are missing: {', '.join(missing_inputs)}",
+                )
 
     def _validate_clouds_regions_are_valid(self):
         message = "The region '{}' is not valid."
-        for cloud in self._tree.clouds.nodes:
+        regions = set(AWS_REGIONS + AZURE_REGIONS)
+        for cloud in self._tree.get_clouds():
             if cloud.value and cloud.value.text:
                 region = cloud.value.text
-                if region not in set(AWS_REGIONS + AZURE_REGIONS):
+                if region not in regions:
                     self._add_diagnostic(cloud.value, message=message.format(region))
 
     def _check_for_unused_blueprint_inputs(self):
-        if self._tree.inputs:
-            message = "Unused variable {}"
-            source = self._document.source
-            # build a list of inputs used as "name only" to be matched with a blueprint input
-            name_only_inputs = {}
-
-            for app in self._tree.get_applications():
-                for var in app.inputs:
-                    if var.value is None and var.key.text not in name_only_inputs:
-                        name_only_inputs[var.key.text] = 1
-
-            for srv in self._tree.get_services():
-                for var in srv.inputs:
-                    if var.value is None and var.key.text not in name_only_inputs:
-                        name_only_inputs[var.key.text] = 1
-            # search if used as a variable
-            for input in self._tree.get_inputs():
-                if input.key.text not in name_only_inputs:
-                    found = re.findall(
-                        "^[^#\\n]*(\$\{"
-                        + input.key.text
-                        + "\}|\$"
-                        + input.key.text
-                        + "\\b)",
-                        source,
-                        re.MULTILINE,
-                    )
-                    if len(found) == 0:
-                        self._add_diagnostic(
-                            input.key,
-                            message=message.format(input.key.text),
-                            diag_severity=DiagnosticSeverity.Warning,
-                        )
+        # inputs referenced from apps, services and artifacts were collected
+        # while validating them, search the document only for the rest
+        unused_inputs = self.blueprint_inputs - self._used_inputs
+        if not unused_inputs:
+            return
+
+        message = "Unused variable {}"
+        source = self._document.source
+        for input in self._tree.get_inputs():
+            if input.key.text not in unused_inputs:
+                continue
+
+            found = re.findall(
+                "^[^#\\n]*(\$\{" + input.key.text + "\}|\$" + input.key.text + "\\b)",
+                source,
+                re.MULTILINE,
+            )
+            if len(found) == 0:
+                self._add_diagnostic(
+                    input.key,
+                    message=message.format(input.key.text),
+                    diag_severity=DiagnosticSeverity.Warning,
+                )
 
-    def _is_valid_auto_var(self, var_name):
-        if var_name.lower() in PREDEFINED_TORQUE_INPUTS:
+    def _is_valid_auto_var(self, var_name, lvar: str = None):
+        # lvar is the lowercased var_name when the caller already has it
+        if lvar is None:
+            lvar = var_name.lower()
+        if lvar in PREDEFINED_TORQUE_INPUTS:
             return True, ""
 
+        error_message = f"{var_name} is not a valid Torque-generated variable"
         parts = var_name.split(".")
-        if not parts[0].lower() == "$torque":
-            return False, f"{var_name} is not a valid Torque-generated variable"
+        lparts = lvar.split(".")
+        if len(lparts) < 2 or lparts[0] != "$torque":
+            return False, error_message
 
-        if not parts[1].lower() in ["applications", "services", "parameters", "repos"]:
-            return False, f"{var_name} is not a valid Torque-generated variable"
+        if lparts[1] not in _AUTO_VAR_KINDS:
+            return False, error_message
 
-        if len(parts) == 3:
-            if not parts[1] == "parameters":
-                return False, f"{var_name} is not a valid Torque-generated variable"
+        if len(lparts) == 3:
+            if lparts[1] != "parameters":
+                return False, error_message
             else:
                 # currently no other validation for parameter store inputs
                 return True, ""
 
-        if len(parts) == 4:
-            if parts[1] == "repos" and parts[3] not in ["token", "url"]:
-                return False, f"{var_name} is not a valid Torque-generated variable"
-            elif parts[1] == "applications" and not parts[3] == "dns":
-                return False, f"{var_name} is not a valid Torque-generated variable"
+        if len(lparts) == 4:
+            if lparts[1] == "repos" and lparts[3] not in ["token", "url"]:
+                return False, error_message
+            elif lparts[1] == "applications" and lparts[3] != "dns":
+                return False, error_message
             else:
                 return True, ""
 
-        if len(parts) == 5:
-            if parts[1].lower() == "applications" and (
-                not parts[3].lower() == "outputs" and not parts[3].lower() == "dns"
-            ):
-                return False, f"{var_name} is not a valid Torque-generated variable"
+        if len(lparts) == 5:
+            if (lparts[1], lparts[3]) not in _VALID_KIND_SECTIONS:
+                return False, error_message
 
-            if parts[1].lower() == "services" and not parts[3].lower() == "outputs":
-                return False, f"{var_name} is not a valid Torque-generated variable"
-
-            if parts[1] == "applications":
-                apps = self.blueprint_apps
-                if not parts[2] in apps:
+            if lparts[1] == "applications":
+                if parts[2] not in self._apps_by_id:
                     return (
                         False,
-                        f"{var_name} is not a valid Torque-generated variable (no such app in the blueprint)",
+                        f"{error_message} (no such app in the blueprint)",
                     )
 
                 app_outputs = applications.get_outputs(resource_name=parts[2])
-                if parts[4] not in app_outputs:
+                if app_outputs is not None and parts[4] not in app_outputs:
                     return (
                         False,
-                        f"{var_name} is not a valid Torque-generated variable ('{parts[2]}' does not have the output '{parts[4]}')",
+                        f"{error_message} ('{parts[2]}' does not have the output '{parts[4]}')",
                     )
 
-            if parts[1] == "services":
-                srvs = self.blueprint_services
-                if not parts[2] in srvs:
-                    return False, (
-                        f"{var_name} is not a valid Torque-generated "
-                        f"variable (no such service in the blueprint)"
-                    )
+            if lparts[1] == "services":
+                if parts[2] not in self._srvs_by_id:
+                    return False, f"{error_message} (no such service in the blueprint)"
 
                 srv_outputs = services.get_outputs(resource_name=parts[2])
-                if parts[4] not in srv_outputs:
+                if srv_outputs is not None and parts[4] not in srv_outputs:
                     return False, (
-                        f"{var_name} is not a valid Torque-generated variable ('{parts[2]}' "
+                        f"{error_message} ('{parts[2]}' "
                         f"does not have the output '{parts[4]}')"
                     )
 
         else:
-            return (
-                False,
-                f"{var_name} is not a valid Torque-generated variable (too many parts)",
-            )
+            return False, f"{error_message} (too many parts)"
 
         return True, ""
 
-    def _validate_var_being_used_is_defined(self):
-        bp_inputs = (
-            {input.key.text for input in self._tree.get_inputs()}
-            if self._tree.inputs
-            else {}
-        )
-
-        for app in self._tree.get_applications():
-            for input in app.inputs:
-                self._confirm_variable_defined_in_blueprint_or_auto_var(
-                    bp_inputs, input
-                )
-
-        for srv in self._tree.get_services():
-            for input in srv.inputs:
-                self._confirm_variable_defined_in_blueprint_or_auto_var(
-                    bp_inputs, input
-                )
-
-        for art in self._tree.get_artifacts():
-            self._confirm_variable_defined_in_blueprint_or_auto_var(bp_inputs, art)
-
     def _confirm_variable_defined_in_blueprint_or_auto_var(self, bp_inputs, input):
         # need to break value to parts to handle variables in {} like:
         # abcd/${some_var}/asfsd/${var2}
         # and highlight these portions
         message = "Variable '{}' is not defined"
-        regex = re.compile("(\$\{.+?\}|^\$.+?$)")
         try:
-            if input.value:
-                iterator = regex.finditer(input.value.text)
+            # most values are plain text, no need to run the regex on them
+            if input.value and "$" in input.value.text:
+                iterator = _VAR_RE.finditer(input.value.text)
                 for match in iterator:
                     cur_var = match.group()
                     pos = match.span()
@@ -295,94 +311,73 @@ class BlueprintValidationHandler(ValidationHandler):
                         pos = (pos[0] + 1, pos[1] + 1)
                     if cur_var.startswith("${") and cur_var.endswith("}"):
                         cur_var = "$" + cur_var[2:-1]
+                    lower_var = cur_var.lower()
 
-                    diag_range = Range(
-                        start=Position(
-                            line=input.value.start_pos[0],
-                            character=input.value.start_pos[1] + pos[0],
-                        ),
-                        end=Position(
-                            line=input.value.end_pos[0],
-                            character=input.value.start_pos[1] + pos[1],
-                        ),
-                    )
+                    error = None
                     if cur_var.startswith("$") and "." not in cur_var:
                         var = cur_var.replace("$", "")
+                        self._used_inputs.add(var)
                         if var not in bp_inputs:
-                            self._diagnostics.append(
-                                Diagnostic(
-                                    range=diag_range,
-                                    message=message.format(cur_var),
-                                )
-                            )
-                    elif cur_var.lower().startswith("$torque"):
-                        valid_var, error_message = self._is_valid_auto_var(cur_var)
+                            error = message.format(cur_var)
+                    elif lower_var.startswith("$torque"):
+                        valid_var, error_message = self._is_valid_auto_var(
+                            cur_var, lower_var
+                        )
                         if not valid_var:
-                            self._diagnostics.append(
-                                Diagnostic(
-                                    range=diag_range,
-                                    message=error_message,
-                                )
-                            )
+                            error = error_message
                     else:
-                        self._diagnostics.append(
-                            Diagnostic(
-                                range=diag_range,
-                                message=message.format(cur_var),
-                            )
+                        error = message.format(cur_var)
+
+                    if error:
+                        self._add_diagnostic(
+                            start_pos=(
+                                input.value.start_pos[0],
+                                input.value.start_pos[1] + pos[0],
+                            ),
+                            end_pos=(
+                                input.value.end_pos[0],
+                                input.value.start_pos[1] + pos[1],
+                            ),
+                            message=error,
                         )
         except Exception as ex:
             print(ex)
 
     def _validate_apps_and_services_are_unique(self):
         # check that there are no duplicate names in the apps being used
-        duplicated = {}
-        apps = {}
-
-        for app in self._tree.get_applications():
-            if app.id.text not in apps:
-                apps[app.id.text] = app
-            else:
-                msg = "This application is already defined. Each application should be defined only once."
-                self._add_diagnostic(app.id, message=msg)
-
-                if app.id.text not in duplicated:
-                    prev_app = apps[app.id.text]
-                    self._add_diagnostic(prev_app.id, message=msg)
-                    duplicated[app.id.text] = 1
+        msg = "This application is already defined. Each application should be defined only once."
+        for nodes in self._apps_by_id.values():
+            if len(nodes) > 1:
+                for app in nodes:
+                    self._add_diagnostic(app.id, message=msg)
 
         # check that there are no duplicate names in the services being used
-        srvs = {}
-        for srv in self._tree.get_services():
-            if srv.id.text not in srvs:
-                srvs[srv.id.text] = srv
-            else:
-                msg = "This service is already defined. Each service should be defined only once."
-                self._add_diagnostic(srv.id, message=msg)
-
-                if srv.id.text not in duplicated:
-                    prev_srv = srvs[srv.id.text]
-                    self._add_diagnostic(prev_srv.id, message=msg)
-                    duplicated[srv.id.text] = 1
-
-                # check that there is no app with this name
-                if srv.id.text in apps:
-                    msg = (
-                        "There is already an application with the same name in this blueprint. "
-                        "Make sure the names are unique."
-                    )
+        msg = "This service is already defined. Each service should be defined only once."
+        for nodes in self._srvs_by_id.values():
+            if len(nodes) > 1:
+                for srv in nodes:
                     self._add_diagnostic(srv.id, message=msg)
 
-                    prev_app = apps[srv.id.text]
-                    self._add_diagnostic(prev_app.id, message=msg)
+        # check that there is no app with the same name as a service
+        msg = (
+            "There is already an application with the same name in this blueprint. "
+            "Make sure the names are unique."
+        )
+        for name, nodes in self._srvs_by_id.items():
+            if name in self._apps_by_id:
+                for res in nodes + self._apps_by_id[name]:
+                    self._add_diagnostic(res.id, message=msg)
 
-    def _validate_artifacts_apps_are_defined(self):
+    def _validate_artifacts(self):
         for art in self._tree.get_artifacts():
             if art.key.text not in self.blueprint_apps:
                 self._add_diagnostic(
                     art.key,
                     message="This application is not defined in this blueprint.",
                 )
+            self._confirm_variable_defined_in_blueprint_or_auto_var(
+                self.blueprint_inputs, art
+            )
 
     def _validate_artifacts_are_unique(self):
         if self._tree.artifacts:
@@ -400,55 +395,6 @@ class BlueprintValidationHandler(ValidationHandler):
                         self._add_diagnostic(prev_art.key, message=msg)
                         duplicated[prev_art.key.text] = 1
 
-    def _validate_apps_inputs_exists(self):
-        apps = applications.get_available_resources_names()
-        for app in self._tree.get_applications():
-            if app.id.text in apps:
-                app_inputs = applications.get_inputs(app.id.text)
-                used_inputs = []
-                for input in app.inputs:
-                    used_inputs.append(input.key.text)
-                    if input.key.text not in app_inputs:
-                        self._add_diagnostic(
-                            input.key,
-                            message=f"The application '{app.id.text}' does not have "
-                            f"an input named '{input.key.text}'",
-                        )
-                missing_inputs = []
-                for input in app_inputs:
-                    if app_inputs[input] is None and input not in used_inputs:
-                        missing_inputs.append(input)
-                if missing_inputs:
-                    self._add_diagnostic(
-                        app.id,
-                        message=f"The following mandatory inputs are missing: {', '.join(missing_inputs)}",
-                    )
-
-    def _validate_services_inputs_exists(self):
-        srvs = services.get_available_resources_names()
-        for srv in self._tree.get_services():
-            if srv.id.text in srvs:
-                srv_inputs = services.get_inputs(srv.id.text)
-                used_inputs = []
-
-                for input in srv.inputs:
-                    used_inputs.append(input.key.text)
-                    if input.key.text not in srv_inputs:
-                        self._add_diagnostic(
-                            input.key,
-                            message=f"The service '{srv.id.text}' does not have an "
-                            f"input named '{input.key.text}'",
-                        )
-                missing_inputs = []
-                for input in srv_inputs:
-                    if srv_inputs[input] is None and input not in used_inputs:
-                        missing_inputs.append(input)
-                if missing_inputs:
-                    self._add_diagnostic(
-                        srv.id,
-                        message=f"The following mandatory inputs are missing: {', '.join(missing_inputs)}",
-                    )
-
     def _validate_blueprint_networking_gateway_not_same_as_management_or_application(
         self,
     ):
@@ -481,7 +427,7 @@ class BlueprintValidationHandler(ValidationHandler):
         for input_node in bp_inputs:
             if input_node.value:
                 default_val = input_node.default_value
-                if isinstance(default_val, ScalarNode):
+                if default_val is None or isinstance(default_val, ScalarNode):
                     continue
                 possible_values = [value.text for value in input_node.possible_values]
 
@@ -496,7 +442,30 @@ class BlueprintValidationHandler(ValidationHandler):
                         message=f"Default value '{default_val.value.text}' must be in the list of possible values")
 
 
+    def _get_results_cache_key(self):
+        try:
+            root_path = get_repo_root_path(self._document.path)
+            # resources must be up to date, a rescan changes their generation
+            applications.get_available_resources(root_path)
+            services.get_available_resources(root_path)
+        except Exception:
+            return None
+
+        # diagnostics depend on positions, so the whole source is hashed
+        source_hash = hashlib.blake2b(self._document.source.encode("utf-8")).digest()
+        return (
+            self._document.path,
+            source_hash,
+            applications.generation,
+            services.generation,
+        )
+
     def validate(self):
+        cache_key = self._get_results_cache_key()
+        if cache_key in self.results_cache:
+            self.results_cache.move_to_end(cache_key)
+            return list(self.results_cache[cache_key])
+
         super().validate()
 
         try:
@@ -507,26 +476,19 @@ class BlueprintValidationHandler(ValidationHandler):
                 "environmentType": None,
             }
 
-            _ = applications.get_available_resources(root_path)
-            _ = services.get_available_resources(root_path)
+            available_apps = applications.get_available_resources(root_path) or {}
+            available_srvs = services.get_available_resources(root_path) or {}
+            # errors on apps, services and artifacts, also collect the used inputs
+            self._validate_resources(available_apps, available_srvs)
+            self._validate_artifacts()
             # warnings
             self._check_for_unused_blueprint_inputs()
             self._check_for_deprecated_properties(deprecated_properties)
             self._check_for_deprecated_syntax()
             # errors
             self._validate_default_value_in_possible_values()
-            self._validate_blueprint_resources_have_input_values()
-            self._validate_dependency_exists()
-            self._validate_var_being_used_is_defined()
-            self._validate_non_existing_app_is_used()
-            self._validate_non_existing_service_is_used()
             self._validate_apps_and_services_are_unique()
-            self._validate_artifacts_apps_are_defined()
             self._validate_artifacts_are_unique()
-            self._validate_apps_inputs_exists()
-            self._validate_services_inputs_exists()
-            self._validate_used_apps_are_valid()
-            self._validate_used_services_are_valid()
             self._validate_clouds_regions_are_valid()
             self._validate_blueprint_networking_gateway_not_same_as_management_or_application()
         except Exception as ex:
@@ -541,4 +503,9 @@ class BlueprintValidationHandler(ValidationHandler):
                 ex,
             )
 
+        if cache_key is not None:
+            self.results_cache[cache_key] = list(self._diagnostics)
+            if len(self.results_cache) > self.results_cache_size:
+                self.results_cache.popitem(last=False)
+
         return self._diagnostics
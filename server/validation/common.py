@@ -14,9 +14,33 @@ from server.ats.trees.common import BaseTree, YamlNode
 class ValidationHandler:
     def __init__(self, tree: BaseTree, document: Document) -> None:
         self._tree = tree
-        self._diagnostics: List[Diagnostic] = []
+        # (start line, start char, end line, end char, message, severity) tuples
+        # which are turned into Diagnostic objects when diagnostics are requested
+        self._pending: List[tuple] = []
+        self._emitted: List[Diagnostic] = []
         self._document = document
 
+    @property
+    def _diagnostics(self) -> List[Diagnostic]:
+        if self._pending:
+            # positions are always ints and messages are strings,
+            # so pydantic validation is skipped by using construct()
+            self._emitted.extend(
+                Diagnostic.construct(
+                    range=Range.construct(
+                        start=Position.construct(line=start_line, character=start_char),
+                        end=Position.construct(line=end_line, character=end_char),
+                    ),
+                    message=message,
+                    severity=severity,
+                )
+                for start_line, start_char, end_line, end_char, message, severity
+                in self._pending
+            )
+            self._pending.clear()
+
+        return self._emitted
+
     def _add_diagnostic(
         self,
         node: YamlNode = None,
@@ -29,35 +53,14 @@ class ValidationHandler:
             raise ValueError("Neither node object nor position tuples were provided")
 
         if node is not None:
-            start = {
-                "line": node.start_pos[0],
-                "character": node.start_pos[1]
-            }
-            end = {
-                "line": node.end_pos[0],
-                "character": node.end_pos[1]
-            }
-        elif len(start_pos) == 2 and len(end_pos) == 2:
-            start = {
-                "line": start_pos[0],
-                "character": start_pos[1]
-            }
-            end = {
-                "line": end_pos[0],
-                "character": end_pos[1]
-            }
-        else:
+            start_pos = node.start_pos
+            end_pos = node.end_pos
+        elif len(start_pos) != 2 or len(end_pos) != 2:
             raise ValueError
 
-        range = Range(start=Position(**start), end=Position(**end))
-
-        self._diagnostics.append(
-            Diagnostic(
-                    range=range,
-                    message=message,
-                    severity=diag_severity,
-                )
-            )
+        self._pending.append(
+            (start_pos[0], start_pos[1], end_pos[0], end_pos[1], message, diag_severity)
+        )
 
     def _validate_no_duplicates_in_inputs(self):
         message = "Multiple declarations of input '{}'"
@@ -0,0 +1,243 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from server.utils.applications import ApplicationsManager
+from server.utils.services import ServicesManager
+
+
+class TestResourcesManager(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self._reset_caches()
+
+    def tearDown(self) -> None:
+        self._reset_caches()
+        self._tmp.cleanup()
+
+    @staticmethod
+    def _reset_caches():
+        for manager in [ApplicationsManager, ServicesManager]:
+            manager.cache.clear()
+            manager.scanned_folders.clear()
+            manager.reloaded_sources.clear()
+            manager.cache_folder = None
+
+    def _add_resource(self, folder: str, name: str, source: str):
+        res_dir = os.path.join(self.root, folder, name)
+        os.makedirs(res_dir)
+        with open(os.path.join(res_dir, f"{name}.yaml"), "w") as f:
+            f.write(source)
+
+    def _touch(self, folder: str):
+        # make sure the folder mtime changes even on a coarse-grained file system
+        path = os.path.join(self.root, folder)
+        mtime = os.stat(path).st_mtime + 1
+        os.utime(path, (mtime, mtime))
+
+    def test_resource_with_wrong_kind_is_loaded(self):
+        self._add_resource("applications", "wrong", "kind: blueprint\nspec_version: 1\n")
+        self._add_resource(
+            "applications",
+            "web",
+            "kind: application\nspec_version: 1\noutputs:\n  - URL\n",
+        )
+
+        apps = ApplicationsManager.get_available_resources(self.root)
+
+        self.assertEqual(set(apps), {"wrong", "web"})
+        self.assertIsNotNone(apps["wrong"]["tree"])
+        self.assertIsNone(ApplicationsManager.get_outputs("wrong"))
+        self.assertEqual(ApplicationsManager.get_inputs("wrong"), {})
+        self.assertEqual(ApplicationsManager.get_outputs("web"), ["URL"])
+
+    def test_invalid_resource_has_unknown_outputs(self):
+        self._add_resource("services", "db", "kind: TerraForm\n  inputs: [\n")
+
+        srvs = ServicesManager.get_available_resources(self.root)
+
+        self.assertIsNone(srvs["db"]["tree"])
+        self.assertIsNone(ServicesManager.get_outputs("db"))
+        self.assertEqual(ServicesManager.get_outputs("missing"), [])
+
+    def test_resources_are_rescanned_when_folder_changes(self):
+        self._add_resource("applications", "web", "kind: application\nspec_version: 1\n")
+
+        apps = ApplicationsManager.get_available_resources(self.root)
+        self.assertEqual(set(apps), {"web"})
+        generation = ApplicationsManager.generation
+
+        # the folder is not changed, the cache is used as is
+        with patch("builtins.open") as open_mock:
+            ApplicationsManager.get_available_resources(self.root)
+            open_mock.assert_not_called()
+        self.assertEqual(ApplicationsManager.generation, generation)
+
+        self._add_resource("applications", "api", "kind: application\nspec_version: 1\n")
+        self._touch("applications")
+
+        apps = ApplicationsManager.get_available_resources(self.root)
+        self.assertEqual(set(apps), {"web", "api"})
+        self.assertGreater(ApplicationsManager.generation, generation)
+
+    def test_missing_resources_folder(self):
+        self.assertEqual(ApplicationsManager.get_available_resources(self.root), {})
+
+        self._add_resource("applications", "web", "kind: application\nspec_version: 1\n")
+        apps = ApplicationsManager.get_available_resources(self.root)
+        self.assertEqual(set(apps), {"web"})
+
+    def test_rescan_keeps_reloaded_documents(self):
+        self._add_resource("applications", "web", "kind: application\nspec_version: 1\n")
+        ApplicationsManager.get_available_resources(self.root)
+
+        # an unsaved change of the opened document
+        ApplicationsManager.reload_resource_details(
+            "web", "kind: application\nspec_version: 1\noutputs:\n  - URL\n"
+        )
+        self._add_resource("applications", "api", "kind: application\nspec_version: 1\n")
+        self._touch("applications")
+        ApplicationsManager.get_available_resources(self.root)
+
+        self.assertEqual(ApplicationsManager.get_outputs("web"), ["URL"])
+
+    def test_failed_rescan_keeps_cache(self):
+        self._add_resource("applications", "web", "kind: application\nspec_version: 1\n")
+        apps = ApplicationsManager.get_available_resources(self.root)
+
+        self._add_resource("applications", "api", "kind: application\nspec_version: 1\n")
+        self._touch("applications")
+        with patch("builtins.open", side_effect=OSError):
+            with self.assertRaises(OSError):
+                ApplicationsManager.get_available_resources(self.root)
+
+        self.assertEqual(set(apps), {"web"})
+        # the folder is rescanned on the next call
+        apps = ApplicationsManager.get_available_resources(self.root)
+        self.assertEqual(set(apps), {"web", "api"})
+
+
+    def test_resources_of_same_root_in_other_form(self):
+        repo_root = os.path.join(self.root, "repo")
+        self._add_resource(
+            os.path.join("repo", "applications"), "web", "kind: application\nspec_version: 1\n"
+        )
+        apps = ApplicationsManager.get_available_resources(repo_root)
+        generation = ApplicationsManager.generation
+
+        same_root = os.path.join(repo_root, "applications", "..")
+        with patch("builtins.open") as open_mock:
+            self.assertIs(ApplicationsManager.get_available_resources(same_root), apps)
+            # the workspace is a parent folder of the repo
+            self.assertIs(ApplicationsManager.get_available_resources(self.root), apps)
+            self.assertIs(ApplicationsManager.get_available_resources(repo_root), apps)
+            open_mock.assert_not_called()
+
+        self.assertEqual(set(apps), {"web"})
+        self.assertEqual(ApplicationsManager.generation, generation)
+
+    def test_resources_of_two_repos(self):
+        other_root = os.path.join(self.root, "other")
+        self._add_resource("applications", "web", "kind: application\nspec_version: 1\n")
+        self._add_resource(
+            os.path.join("other", "applications"), "api", "kind: application\nspec_version: 1\n"
+        )
+
+        apps = ApplicationsManager.get_available_resources(self.root)
+        ApplicationsManager.reload_resource_details(
+            "web", "kind: application\nspec_version: 1\noutputs:\n  - URL\n"
+        )
+        self.assertEqual(set(ApplicationsManager.get_available_resources(other_root)), {"api"})
+
+        # switching back needs no rescan and keeps the reloaded document
+        with patch("builtins.open") as open_mock:
+            apps = ApplicationsManager.get_available_resources(self.root)
+            open_mock.assert_not_called()
+        self.assertEqual(set(apps), {"web"})
+        self.assertEqual(ApplicationsManager.get_outputs("web"), ["URL"])
+
+
+class TestServicesManager(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.srv_dir = self._tmp.name
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _write(self, name: str, content: str, encoding: str = "utf-8"):
+        path = os.path.join(self.srv_dir, name)
+        with open(path, "w", encoding=encoding) as f:
+            f.write(content)
+        return path
+
+    def test_get_service_vars(self):
+        path = self._write("sleep.yaml", "spec_version: 1\nkind: TerraForm  # comment\n")
+        self._write("vars.tfvars", "seconds = 10\n")
+        self._write("main.tf", "variable \"seconds\" {}\n")
+        os.mkdir(os.path.join(self.srv_dir, "dir.tfvars"))
+
+        self.assertEqual(
+            ServicesManager.get_service_vars(f"file://{path}"),
+            [{"file": "vars.tfvars", "variables": ["seconds"]}],
+        )
+
+    def test_get_service_vars_with_bom(self):
+        path = self._write("sleep.yaml", "kind: 'TerraForm'\n", encoding="utf-8-sig")
+        self._write("vars.tfvars", "seconds = 10\n")
+
+        self.assertEqual(
+            ServicesManager.get_service_vars(path),
+            [{"file": "vars.tfvars", "variables": ["seconds"]}],
+        )
+
+    def test_get_service_vars_of_other_kind(self):
+        self._write("vars.tfvars", "seconds = 10\n")
+
+        path = self._write("app.yaml", "kind: application\n")
+        self.assertEqual(ServicesManager.get_service_vars(path), [])
+
+        # a nested 'kind' is not the document kind
+        path = self._write("no-kind.yaml", "inputs:\n  kind: TerraForm\n")
+        self.assertEqual(ServicesManager.get_service_vars(path), [])
+
+    def test_get_vars_from_tfvars(self):
+        path = self._write(
+            "vars.tfvars",
+            "region = \"eu-west-1\"\n"
+            "  instance_type=\"t2.micro\"\n"
+            "# commented_out = 1\n"
+            "// commented_out_too = 1\n"
+            "tags = {\n"
+            "  owner = \"me\"\n"
+            "  \"cost-center\" = \"42\"\n"
+            "  nested = { key = \"value\" }\n"
+            "}\n"
+            "subnets = [\n"
+            "  { cidr = \"10.0.0.0/24\" },\n"
+            "]\n"
+            "db-name = \"app\"\n"
+            "description = \"use [ to start, \\\" { is quoted\"\n"
+            "zone = \"z\" # closing ] in a comment\n"
+            "count = 1 // opening { in a comment\n"
+            "url = \"http://host/#{\"\n"
+            "last = true\n",
+        )
+
+        self.assertEqual(
+            ServicesManager.get_vars_from_tfvars(path),
+            [
+                "region",
+                "instance_type",
+                "tags",
+                "subnets",
+                "db-name",
+                "description",
+                "zone",
+                "count",
+                "url",
+                "last",
+            ],
+        )
@@ -1,6 +1,7 @@
+import os
 import unittest
 from typing import Tuple
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from pygls.lsp.types.basic_structures import Position, Range
 from server.ats.trees.blueprint import (
@@ -29,6 +30,8 @@ from trees import (
     demoapp_tree,
     sleep_srv_tree,
 )
+from server.utils.applications import ApplicationsManager as applications
+from server.utils.services import ServicesManager as services
 from server.validation.app_validator import AppValidationHandler
 from server.validation.bp_validatior import BlueprintValidationHandler
 from server.validation.common import ValidationHandler
@@ -154,6 +157,22 @@ class TestValidationHandler(unittest.TestCase):
 
 
 class TestBlueprintValidationHandler(TestValidationHandler):
+    def setUp(self) -> None:
+        super().setUp()
+        self._reset_caches()
+
+    def tearDown(self) -> None:
+        self._reset_caches()
+
+    @staticmethod
+    def _reset_caches():
+        BlueprintValidationHandler.results_cache.clear()
+        for manager in [applications, services]:
+            manager.cache.clear()
+            manager.scanned_folders.clear()
+            manager.reloaded_sources.clear()
+            manager.cache_folder = None
+
     def test_validate_default_value_not_in_possible_values_list(self):
         wrong_value = "ba"
 
@@ -273,7 +292,10 @@ class TestBlueprintValidationHandler(TestValidationHandler):
             ),
         )
         validator = BlueprintValidationHandler(tree, self.test_doc)
-        validator._validate_blueprint_resources_have_input_values()
+        for app in tree.get_applications():
+            validator._check_resource_inputs(app, "Application")
+        for srv in tree.get_services():
+            validator._check_resource_inputs(srv, "Service")
 
         self.assertEqual(len(validator._diagnostics), 2)
         if validator._diagnostics:
@@ -291,3 +313,236 @@ class TestBlueprintValidationHandler(TestValidationHandler):
                         self._get_range((9, 10), (9, 15)),
                     ]
                 )
+
+    def test_validate_apps_and_services_are_unique(self):
+        def app(name, line):
+            return ApplicationNode(
+                key=ScalarNode(start_pos=(line, 4), end_pos=(line, 4 + len(name)), _text=name)
+            )
+
+        def srv(name, line):
+            return ServiceNode(
+                key=ScalarNode(start_pos=(line, 4), end_pos=(line, 4 + len(name)), _text=name)
+            )
+
+        tree = BlueprintTree(
+            applications=PropertyNode(
+                key=ScalarNode(_text="applications"),
+                value=BlueprintTree.AppsSequence(
+                    nodes=[app("web", 2), app("web", 3), app("db", 4)]
+                ),
+            ),
+            services=PropertyNode(
+                key=ScalarNode(_text="services"),
+                value=BlueprintTree.ServicesSequence(nodes=[srv("db", 6)]),
+            ),
+        )
+        validator = BlueprintValidationHandler(tree, self.test_doc)
+        validator._validate_apps_and_services_are_unique()
+        diags = validator._diagnostics
+
+        self.assertEqual(len(diags), 4)
+        for d in diags[:2]:
+            self.assertEqual(
+                d.message,
+                "This application is already defined. Each application should be defined only once.",
+            )
+        self.assertEqual(diags[0].range, self._get_range((2, 4), (2, 7)))
+        self.assertEqual(diags[1].range, self._get_range((3, 4), (3, 7)))
+        for d in diags[2:]:
+            self.assertTrue(d.message.startswith("There is already an application with the same name"))
+        self.assertEqual(diags[2].range, self._get_range((6, 4), (6, 6)))
+        self.assertEqual(diags[3].range, self._get_range((4, 4), (4, 6)))
+
+    def test_is_valid_auto_var(self):
+        validator = BlueprintValidationHandler(BlueprintTree(), self.test_doc)
+
+        for var in [
+            "$torque.environment.id",
+            "$TORQUE.ENVIRONMENT.PUBLIC_ADDRESS",
+            "$torque.parameters.db_password",
+            "$Torque.Parameters.db_password",
+            "$torque.repos.current.token",
+        ]:
+            self.assertEqual(validator._is_valid_auto_var(var), (True, ""), var)
+
+        for var in [
+            "$torque",
+            "$torque.something.x",
+            "$torque.repos.current.branch",
+            "$torque.repos.current.outputs.x",
+            "$torque.applications.web.outputs.x",
+            "$torque.services.db.outputs.x",
+            "$torque.applications.web.outputs.x.y",
+        ]:
+            valid, message = validator._is_valid_auto_var(var)
+            self.assertFalse(valid, var)
+            self.assertTrue(message.startswith(f"{var} is not a valid Torque-generated variable"))
+
+    def test_outputs_of_invalid_resource_are_not_validated(self):
+        tree = BlueprintTree(
+            services=PropertyNode(
+                key=ScalarNode(_text="services"),
+                value=BlueprintTree.ServicesSequence(
+                    nodes=[ServiceNode(key=ScalarNode(_text="db"))]
+                ),
+            )
+        )
+        validator = BlueprintValidationHandler(tree, self.test_doc)
+        var = "$torque.services.db.outputs.HOST"
+
+        invalid = {"db": {"tree": None, "completion": None, "inputs": {}, "outputs": None}}
+        with patch.dict(services.cache, invalid, clear=True):
+            self.assertEqual(validator._is_valid_auto_var(var), (True, ""))
+
+        valid = {"db": {"tree": None, "completion": None, "inputs": {}, "outputs": ["PORT"]}}
+        with patch.dict(services.cache, valid, clear=True):
+            valid_var, message = validator._is_valid_auto_var(var)
+            self.assertFalse(valid_var)
+            self.assertTrue(message.endswith("('db' does not have the output 'HOST')"))
+
+    def test_validate_resource_dependencies(self):
+        app = ApplicationNode(
+            key=ScalarNode(start_pos=(2, 4), end_pos=(2, 7), _text="web"),
+            value=ApplicationResourceNode(
+                depends_on=PropertyNode(
+                    key=ScalarNode(_text="depends_on"),
+                    value=ScalarNodesSequence(
+                        nodes=[
+                            ScalarNode(start_pos=(4, 10), end_pos=(4, 13), _text="web"),
+                            ScalarNode(start_pos=(5, 10), end_pos=(5, 12), _text="db"),
+                        ]
+                    ),
+                )
+            ),
+        )
+        tree = BlueprintTree(
+            applications=PropertyNode(
+                key=ScalarNode(_text="applications"),
+                value=BlueprintTree.AppsSequence(nodes=[app]),
+            )
+        )
+        validator = BlueprintValidationHandler(tree, self.test_doc)
+        validator._check_resource_dependencies(app)
+        diags = validator._diagnostics
+
+        self.assertEqual(len(diags), 2)
+        self.assertEqual(diags[0].message, "The resource 'web' cannot be dependent of itself")
+        self.assertEqual(diags[0].range, self._get_range((4, 10), (4, 13)))
+        self.assertEqual(
+            diags[1].message,
+            "The application/service 'db' is not defined in the applications/services section",
+        )
+        self.assertEqual(diags[1].range, self._get_range((5, 10), (5, 12)))
+
+    def test_validate_blueprint_without_optional_properties(self):
+        tree = BlueprintTree(
+            inputs=PropertyNode(
+                key=ScalarNode(_text="inputs"),
+                value=BlueprintInputsSequence(
+                    nodes=[
+                        BlueprintInputNode(
+                            key=ScalarNode(_text="ABC"),
+                            value=BlueprintFullInputNode(
+                                description=PropertyNode(
+                                    key=ScalarNode(_text="description"),
+                                    value=ScalarNode(_text="no default value"),
+                                ),
+                            ),
+                        ),
+                    ]
+                ),
+            ),
+        )
+        validator = BlueprintValidationHandler(tree, self.test_doc)
+        validator._validate_default_value_in_possible_values()
+        validator._validate_clouds_regions_are_valid()
+        self.assertEqual(len(validator._diagnostics), 0)
+
+    def test_check_for_unused_blueprint_inputs(self):
+        def bp_input(name, line):
+            return BlueprintInputNode(
+                key=ScalarNode(start_pos=(line, 2), end_pos=(line, 2 + len(name)), _text=name)
+            )
+
+        def text_mapping(key, value):
+            return TextMapping(
+                key=ScalarNode(_text=key),
+                value=ScalarNode(_text=value) if value is not None else None,
+            )
+
+        app = ApplicationNode(
+            key=ScalarNode(_text="web"),
+            value=ApplicationResourceNode(
+                input_values=PropertyNode(
+                    key=ScalarNode(_text="input_values"),
+                    value=TextMappingSequence(
+                        nodes=[text_mapping("path", "#/${A}"), text_mapping("E", None)]
+                    ),
+                )
+            ),
+        )
+        tree = BlueprintTree(
+            inputs=PropertyNode(
+                key=ScalarNode(_text="inputs"),
+                value=BlueprintInputsSequence(
+                    nodes=[bp_input(name, line) for line, name in enumerate("ABCDE", 1)]
+                ),
+            ),
+            applications=PropertyNode(
+                key=ScalarNode(_text="applications"),
+                value=BlueprintTree.AppsSequence(nodes=[app]),
+            ),
+            artifacts=PropertyNode(
+                key=ScalarNode(_text="artifacts"),
+                value=TextMappingSequence(nodes=[text_mapping("web", "$B")]),
+            ),
+        )
+        # C is used outside of apps, services and artifacts, D only in a comment
+        self.test_doc.source = "metadata:\n  description: $C\n# $D\n"
+
+        validator = BlueprintValidationHandler(tree, self.test_doc)
+        validator._check_resource_inputs(app, "Application")
+        validator._validate_artifacts()
+        self.assertEqual(validator._used_inputs, {"A", "B", "E"})
+        self.assertEqual(len(validator._diagnostics), 0)
+
+        validator._check_for_unused_blueprint_inputs()
+        diags = validator._diagnostics
+
+        self.assertEqual(len(diags), 1)
+        self.assertEqual(diags[0].message, "Unused variable D")
+        self.assertEqual(diags[0].range, self._get_range((4, 2), (4, 3)))
+
+    def test_validate_results_are_cached(self):
+        path = os.path.join(os.path.dirname(__file__), "fixtures", "blueprints", "azure-simple.yaml")
+        with open(path) as f:
+            source = f.read()
+        self.test_doc.path = path
+        self.test_doc.source = source
+        self.test_doc.lines = source.splitlines(True)
+
+        diags = BlueprintValidationHandler(azuresimple_bp_tree.tree, self.test_doc).validate()
+
+        validator = BlueprintValidationHandler(azuresimple_bp_tree.tree, self.test_doc)
+        with patch.object(validator, "_validate_resources") as validate_resources:
+            self.assertEqual(validator.validate(), diags)
+            validate_resources.assert_not_called()
+
+        # completions ask for resources of the workspace root, which may be
+        # the repo root in another form or its parent folder
+        repo_root = os.path.dirname(os.path.dirname(path))
+        for root in [os.path.join(repo_root, "blueprints", ".."), os.path.dirname(repo_root)]:
+            applications.get_available_resources(root)
+            services.get_available_resources(root)
+        validator = BlueprintValidationHandler(azuresimple_bp_tree.tree, self.test_doc)
+        with patch.object(validator, "_validate_resources") as validate_resources:
+            self.assertEqual(validator.validate(), diags)
+            validate_resources.assert_not_called()
+
+        # any change of the source invalidates the cached result
+        self.test_doc.source = source + "\n"
+        validator = BlueprintValidationHandler(azuresimple_bp_tree.tree, self.test_doc)
+        with patch.object(validator, "_validate_resources") as validate_resources:
+            validator.validate()
+            validate_resources.assert_called_once()